@@ -0,0 +1,30 @@
+"""member leaderboard indexes
+
+Revision ID: 5c1e7f3a9d20
+Revises: b9bee291a668
+Create Date: 2026-10-17 10:12:41.316852
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7f3a9d20'
+down_revision: Union[str, None] = 'b9bee291a668'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.create_index('ix_member_server_id_score', ['server_id', 'score'], unique=False)
+        batch_op.create_index('ix_member_server_id_karma', ['server_id', 'karma'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.drop_index('ix_member_server_id_karma')
+        batch_op.drop_index('ix_member_server_id_score')
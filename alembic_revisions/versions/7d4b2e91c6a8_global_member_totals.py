@@ -0,0 +1,76 @@
+"""global member totals
+
+Revision ID: 7d4b2e91c6a8
+Revises: 5c1e7f3a9d20
+Create Date: 2026-10-17 12:40:18.527103
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4b2e91c6a8'
+down_revision: Union[str, None] = '5c1e7f3a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('global_member_total',
+                    sa.Column('member_id', sa.Integer(), nullable=False),
+                    sa.Column('member_count', sa.Integer(), nullable=False),
+                    sa.Column('score', sa.Integer(), nullable=False),
+                    sa.Column('karma', sa.Float(), nullable=False),
+                    sa.PrimaryKeyConstraint('member_id')
+                    )
+    with op.batch_alter_table('global_member_total', schema=None) as batch_op:
+        batch_op.create_index('ix_global_member_total_score', ['score'], unique=False)
+        batch_op.create_index('ix_global_member_total_karma', ['karma'], unique=False)
+
+    op.execute('INSERT INTO global_member_total (member_id, member_count, score, karma) '
+               'SELECT member_id, count(*), sum(score), sum(karma) FROM member GROUP BY member_id')
+
+    # keep the totals in sync with every write to member, including the upserts and the deletes of the cleanups.
+    # A batch migration that recreates the member table drops these triggers, it must create them again.
+    op.execute('''
+        CREATE TRIGGER member_global_total_insert AFTER INSERT ON member
+        BEGIN
+            INSERT INTO global_member_total (member_id, member_count, score, karma)
+            VALUES (NEW.member_id, 1, NEW.score, NEW.karma)
+            ON CONFLICT (member_id) DO UPDATE SET
+                member_count = member_count + 1,
+                score = score + excluded.score,
+                karma = karma + excluded.karma;
+        END
+    ''')
+    op.execute('''
+        CREATE TRIGGER member_global_total_update AFTER UPDATE OF score, karma ON member
+        BEGIN
+            UPDATE global_member_total
+            SET score = score + NEW.score - OLD.score, karma = karma + NEW.karma - OLD.karma
+            WHERE member_id = NEW.member_id;
+        END
+    ''')
+    op.execute('''
+        CREATE TRIGGER member_global_total_delete AFTER DELETE ON member
+        BEGIN
+            UPDATE global_member_total
+            SET member_count = member_count - 1, score = score - OLD.score, karma = karma - OLD.karma
+            WHERE member_id = OLD.member_id;
+            DELETE FROM global_member_total WHERE member_id = OLD.member_id AND member_count = 0;
+        END
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER member_global_total_delete')
+    op.execute('DROP TRIGGER member_global_total_update')
+    op.execute('DROP TRIGGER member_global_total_insert')
+    with op.batch_alter_table('global_member_total', schema=None) as batch_op:
+        batch_op.drop_index('ix_global_member_total_karma')
+        batch_op.drop_index('ix_global_member_total_score')
+
+    op.drop_table('global_member_total')
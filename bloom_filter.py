@@ -0,0 +1,46 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    A probabilistic set of strings. A value that was added is always reported as contained, a value that was never
+    added is only reported as contained with a probability of about `error_rate`, as long as no more than `capacity`
+    values are added.
+
+    The bit positions are derived from a single blake2b digest with double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The expected amount of values.
+        error_rate : float = 0.01
+            The false positive rate that is kept up to `capacity` values.
+        """
+        self.__size: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.__hash_count: int = max(1, round(self.__size / max(1, capacity) * math.log(2)))
+        self.__bits = bytearray((self.__size + 7) // 8)
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def __positions(self, value: str) -> list[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1  # odd, so the positions do not collapse
+        return [(first + i * second) % self.__size for i in range(self.__hash_count)]
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def add(self, value: str) -> None:
+        """Adds a value to the filter."""
+        for position in self.__positions(value):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def __contains__(self, value: str) -> bool:
+        bits = self.__bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(value))
@@ -1,4 +1,6 @@
+import itertools
 import string
+from typing import Final
 
 """
 The allowed characters in the input.
@@ -41,18 +43,58 @@ FIRST_CHAR_SCORE = {
     "z": 0.09743721376366166
 }
 
+"""Amount of most recently used words of the word cache that are kept in memory"""
+WORD_CACHE_MEMORY_SIZE = 10_000
+
+"""Minimum amount of words the bloom filter over the word cache is sized for"""
+WORD_CACHE_FILTER_MIN_CAPACITY = 100_000
+
+"""False positive rate of the bloom filter over the word cache, while it holds no more words than it is sized for"""
+WORD_CACHE_FILTER_ERROR_RATE = 0.01
+
 """Amount of words kept in history per user"""
 HISTORY_LENGTH = 5
 
+"""Amount of most recently active users per server whose history is kept"""
+HISTORY_MEMBERS_PER_SERVER = 2048
+
 """Amount of karma subtracted for a mistake"""
 MISTAKE_PENALTY = 5
 
+"""Amount of DB connections kept open, tasks needing a connection beyond that wait for one to be returned"""
+DB_CONNECTION_POOL_SIZE = 20
+
+"""Maximum amount of concurrent requests when adding/removing a role to/from members"""
+ROLE_UPDATE_CONCURRENCY = 5
+
 """Minimum karma needed for the reliable role"""
 RELIABLE_ROLE_KARMA_THRESHOLD = 50
 
 """Minimum accuracy needed for the reliable role"""
 RELIABLE_ROLE_ACCURACY_THRESHOLD = .99
 
+"""
+Templates for the notifications sent when a user deletes or edits their word.
+"""
+WORD_DELETED_MESSAGE = '{mention} deleted their word!'
+WORD_DELETED_WITH_LAST_WORD_MESSAGE = '{mention} deleted their word! The **last** word was **{word}**.'
+WORD_EDITED_MESSAGE = '{mention} edited their word!'
+WORD_EDITED_WITH_LAST_WORD_MESSAGE = '{mention} edited their word! The **last** word was **{word}**.'
+
+"""
+Templates for the response to a mistake. The response starts with the reason, followed by the chain length (if there
+was a chain) and the request to restart (with the last letter, if there was a last word).
+"""
+MISTAKE_TWO_WORDS_IN_A_ROW_MESSAGE = '{mention} messed up the count! *You cannot send two words in a row!*'
+MISTAKE_WRONG_LETTER_MESSAGE = ('{mention} messed up the chain! '
+                                '*The word you entered did not begin with the last letter of the previous word* '
+                                '(**{letter}**).')
+MISTAKE_WORD_DOESNT_EXIST_MESSAGE = '{mention} messed up the chain! *The word you entered does not exist.*'
+MISTAKE_CHAIN_LENGTH_MESSAGE = 'The chain length was {count} when it was broken. :sob:\n'
+MISTAKE_RESTART_WITH_LETTER_MESSAGE = ('Restart with a word starting with **{letter}** and '
+                                       'try to beat the current high score of **{high_score}**!')
+MISTAKE_RESTART_MESSAGE = 'Restart and try to beat the current high score of **{high_score}**!'
+
 """
 A dictionary mapping the words to the corresponding special emojis.
 """
@@ -276,7 +318,7 @@ SPECIAL_REACTION_EMOJIS: dict[str, str] = {
 """
 A list of 2-letter words that are not legal words.
 """
-GLOBAL_BLACKLIST_2_LETTER_WORDS: set[str] = {
+GLOBAL_BLACKLIST_2_LETTER_WORDS: Final[frozenset[str]] = frozenset({
     'aa',
     'ab',
     'ac',
@@ -926,13 +968,13 @@ GLOBAL_BLACKLIST_2_LETTER_WORDS: set[str] = {
     'zx',
     'zy',
     'zz'
-}
+})
 
 """
 A global whitelist containing all LEGAL three letter words.
 NOTE: This is a WHITElist, i.e. an inverted blacklist.
 """
-GLOBAL_WHITELIST_3_LETTER_WORDS: set[str] = {
+GLOBAL_WHITELIST_3_LETTER_WORDS: Final[frozenset[str]] = frozenset({
     'eve',
     'ewe',
     'sap',
@@ -1282,12 +1324,12 @@ GLOBAL_WHITELIST_3_LETTER_WORDS: set[str] = {
     'rig',
     'sag',
     'ups'
-}
+})
 
 """
 A list of N-letter words that are not legal words (N > 3).
 """
-GLOBAL_BLACKLIST_N_LETTER_WORDS: set[str] = {
+GLOBAL_BLACKLIST_N_LETTER_WORDS: Final[frozenset[str]] = frozenset({
     'aaaa',
     'bbbb',
     'cccc',
@@ -1308,4 +1350,12 @@ GLOBAL_BLACKLIST_N_LETTER_WORDS: set[str] = {
     'iiiiii',
     'mmmmmm',
     'pppppp'
+})
+
+"""
+The global blacklists grouped by word length, so that checking a word needs a single set lookup only.
+"""
+GLOBAL_BLACKLIST_WORDS_BY_LENGTH: Final[dict[int, frozenset[str]]] = {
+    length: frozenset(words) for length, words in itertools.groupby(
+        sorted(GLOBAL_BLACKLIST_2_LETTER_WORDS | GLOBAL_BLACKLIST_N_LETTER_WORDS, key=len), key=len)
 }
@@ -1,3 +1,4 @@
+import functools
 import math
 from collections import deque
 
@@ -20,7 +21,7 @@ def calculate_decay(n: float, drop_rate: float = .33) -> float:
     float
         A decay factor between 1 and -1 that can be multiplied with the karma.
     """
-    return (2 * math.e ** (-n * drop_rate)) - 1
+    return (2 * math.exp(-n * drop_rate)) - 1
 
 
 def calculate_base_karma(word: str, last_char_bias: float = .7) -> float:
@@ -39,12 +40,18 @@ def calculate_base_karma(word: str, last_char_bias: float = .7) -> float:
     float
         The change in karma, usually closely around 0.
     """
+    return _base_karma(word[0], word[-1], last_char_bias)
+
+
+@functools.cache
+def _base_karma(first_char: str, last_char: str, last_char_bias: float) -> float:
+    # only depends on the first and last character, so there are just a few hundred distinct results to cache
 
     def score_adaption(score: float, exponent: float = .5, rise: float = .025) -> float:
         return score ** exponent + rise
 
-    first_char_score: float = score_adaption(FIRST_CHAR_SCORE[word[0]])  # how difficult is it to find this word
-    last_char_score: float = score_adaption(FIRST_CHAR_SCORE[word[-1]])  # how difficult is it for the next player
+    first_char_score: float = score_adaption(FIRST_CHAR_SCORE[first_char])  # how difficult is it to find this word
+    last_char_score: float = score_adaption(FIRST_CHAR_SCORE[last_char])  # how difficult is it for the next player
 
     first_char_karma: float = (first_char_score - 1) * -1  # distance to average, inverted
     last_char_karma: float = (last_char_score - 1)  # distance to average
@@ -71,9 +78,10 @@ def calculate_total_karma(word: str, last_words: deque[str]) -> float:
         The total change in karma, usually closely around 0.
     """
     end_letter: str = word[-1]
-    weighted_words: list[tuple[float, str]] = [(2 * (len(last_words) - index) / len(last_words), e) for index, e in
-                                               enumerate(last_words)]
-    n: float = sum(weight for weight, e in weighted_words if e[-1] == end_letter)
+    history_length: int = len(last_words)
+    # words are weighted with 2 * (history_length - index) / history_length, the division is done once on the sum
+    n: float = 2 * sum(history_length - index for index, e in enumerate(last_words)
+                       if e[-1] == end_letter) / history_length if history_length else 0
 
     decay: float = calculate_decay(n)
     base_karma: float = calculate_base_karma(word)
@@ -1,29 +1,33 @@
 """Word chain bot for the Indently server"""
 import asyncio
-import concurrent.futures
 import contextlib
 import logging
 import os
 import time
-from collections import defaultdict, deque
-from typing import AsyncIterator, Optional, Sequence
+from collections import OrderedDict, defaultdict, deque
+from typing import AsyncIterator, Iterable, Optional, Sequence
 
+import aiohttp
 import discord
 from alembic import command as alembic_command
 from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from dotenv import load_dotenv
-from requests_futures.sessions import FuturesSession
-from sqlalchemy import CursorResult, delete, exists, func, insert, select, update
+from sqlalchemy import Connection, CursorResult, bindparam, column, delete, event, func, insert, literal, select, table
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine.row import Row
-from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql.functions import count
 
+from bloom_filter import BloomFilter
 from consts import *
 from data import calculate_total_karma
-from model import (BlacklistModel, Member, MemberModel, ServerConfig, ServerConfigModel, UsedWordsModel, WhitelistModel,
-                   WordCacheModel)
+from model import (GLOBAL_MEMBER_TOTAL_TRIGGERS, UPDATE_SERVER_CONFIG, BlacklistModel, GlobalMemberTotalModel,
+                   MemberModel, ServerConfig, ServerConfigModel, UsedWordsModel, WhitelistModel, WordCacheModel)
 
 load_dotenv('.env')
 # running in single player mode changes some game rules - you can chain words alone now
@@ -39,8 +43,41 @@ logger = logging.getLogger(__name__)
 class Bot(commands.AutoShardedBot):
     """Word chain bot for Indently discord server."""
 
-    __SQL_ENGINE = create_async_engine('sqlite+aiosqlite:///database_word_chain.sqlite3')
-    __LOCK = asyncio.Lock()
+    # SQLite only lets one connection write at a time, so writers queue for the single connection of their own pool
+    # instead of polling the busy database, while readers use a separate pool of fixed size (every open connection
+    # of aiosqlite is a thread). Readers never leave a transaction open, so their connections are not rolled back
+    # again when they return to the pool. Since there is only one writer connection, write transactions must never
+    # await Discord or HTTP requests, or all other writers wait for them until they run into the pool timeout.
+    __SQL_WRITE_ENGINE = create_async_engine('sqlite+aiosqlite:///database_word_chain.sqlite3',
+                                             connect_args={'timeout': 30}, pool_size=1, max_overflow=0)
+    __SQL_READ_ENGINE = create_async_engine('sqlite+aiosqlite:///database_word_chain.sqlite3',
+                                            connect_args={'timeout': 30}, pool_size=DB_CONNECTION_POOL_SIZE,
+                                            max_overflow=0, pool_reset_on_return=None)
+    __LEGAL_CHARACTERS = frozenset(POSSIBLE_CHARACTERS)
+
+    # statements of the word chain are built once, the values are bound on execution
+    # existence probes select a constant row instead of EXISTS (...), which SQLite runs a bit faster
+    __INSERT_USED_WORD = insert(UsedWordsModel)
+    __DELETE_USED_WORDS = delete(UsedWordsModel).where(UsedWordsModel.server_id == bindparam('filter_server_id'))
+    __CACHED_WORD_EXISTS = select(literal(1)).where(WordCacheModel.word == bindparam('filter_word')).limit(1)
+    __INSERT_CACHED_WORD = insert(WordCacheModel).prefix_with('OR IGNORE')
+    # a member is inserted with the changes as values, or the changes are added to the existing row
+    __UPSERT_MEMBER_STATS = sqlite_insert(MemberModel).values(
+        server_id=bindparam('filter_server_id'),
+        member_id=bindparam('filter_member_id'),
+        score=bindparam('score_change'),
+        correct=bindparam('correct_change'),
+        wrong=bindparam('wrong_change'),
+        karma=func.max(0, bindparam('karma_change'))
+    ).on_conflict_do_update(
+        index_elements=[MemberModel.server_id, MemberModel.member_id],
+        set_={
+            'score': MemberModel.score + bindparam('score_change'),
+            'correct': MemberModel.correct + bindparam('correct_change'),
+            'wrong': MemberModel.wrong + bindparam('wrong_change'),
+            'karma': func.max(0, MemberModel.karma + bindparam('karma_change'))
+        }
+    )
 
     API_RESPONSE_WORD_EXISTS: int = 1
     API_RESPONSE_WORD_DOESNT_EXIST: int = 0
@@ -54,24 +91,178 @@ class Bot(commands.AutoShardedBot):
         self.server_failed_roles: dict[int, Optional[discord.Role]] = defaultdict(lambda: None)
         self.server_reliable_roles: dict[int, Optional[discord.Role]] = defaultdict(lambda: None)
 
-        self._server_histories: dict[int, dict[int, deque[str]]] = defaultdict(
-            lambda: defaultdict(lambda: deque(maxlen=HISTORY_LENGTH)))
+        # word histories per server and member, each server only keeps the most recently active members
+        self._server_histories: dict[int, OrderedDict[int, deque[str]]] = defaultdict(OrderedDict)
+        self._server_locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._dirty_configs: set[int] = set()  # servers whose config changed since the last write to the DB
+        self._pending_cached_words: set[str] = set()  # words added to the cache since the last write to the DB
+        self._reliable_role_dirty: set[int] = set()  # servers whose reliable role has to be checked again
+        self.server_failed_role_holders: dict[int, Optional[int]] = {}  # last member given the failed role
+        self._recent_cached_words: OrderedDict[str, None] = OrderedDict()  # LRU of words known to be in the cache
+        self._word_cache_filter: Optional[BloomFilter] = None  # all words of the cache, loaded in on_ready
+        self.server_blacklists: dict[int, set[str]] = defaultdict(set)
+        self.server_whitelists: dict[int, set[str]] = defaultdict(set)
+        self.server_used_words: dict[int, set[str]] = defaultdict(set)
+        self._http_session: Optional[aiohttp.ClientSession] = None  # created in setup_hook, needs a running loop
+
+        for engine in (self.__SQL_WRITE_ENGINE, self.__SQL_READ_ENGINE):
+            event.listen(engine.sync_engine, 'connect', self.__on_db_connect)
+            event.listen(engine.sync_engine, 'begin', self.__on_db_begin)
         super().__init__(command_prefix='!', intents=intents)
 
+    @staticmethod
+    def __on_db_connect(dbapi_connection, _connection_record) -> None:
+        # WAL lets readers proceed while a write transaction is running
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        # in WAL mode, NORMAL only syncs at checkpoints and is still safe against corruption
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+        # stop the driver from emitting BEGIN on its own, we do that in __on_db_begin
+        dbapi_connection.isolation_level = None
+
+    @staticmethod
+    def __on_db_begin(connection: Connection) -> None:
+        # writers take the write lock upfront, so they wait for each other (up to the busy timeout) instead of
+        # failing when two deferred transactions try to upgrade their read locks at the same time
+        if connection.get_execution_options().get('begin_immediate', False):
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+        # readers only run single SELECTs, which SQLite wraps in an implicit read transaction on its own, so they skip
+        # the round-trip of an explicit BEGIN
+
     @contextlib.asynccontextmanager
-    async def db_connection(self, locked=True) -> AsyncIterator[AsyncConnection]:
-        logger.debug(f'requesting connection with {locked=}')
-        if locked:
-            start_time = time.monotonic()
-            async with self.__LOCK:
-                wait_time = time.monotonic() - start_time
-                logger.debug(f'Waited {wait_time:.4f} seconds for DB lock')
-                async with self.__SQL_ENGINE.begin() as connection:
+    async def __transaction(self, immediate: bool) -> AsyncIterator[AsyncConnection]:
+        engine: AsyncEngine = self.__SQL_WRITE_ENGINE if immediate else self.__SQL_READ_ENGINE
+        async with engine.connect() as connection:
+            await connection.execution_options(begin_immediate=immediate)
+            async with connection.begin():
+                yield connection
+
+    @contextlib.asynccontextmanager
+    async def db_connection(self, locked: bool = True,
+                            server_id: Optional[int] = None) -> AsyncIterator[AsyncConnection]:
+        """
+        Opens a DB connection with a running transaction.
+
+        Parameters
+        ----------
+        locked : bool = True
+            Whether the transaction is going to write. Writing transactions are started with `BEGIN IMMEDIATE` on the
+            only connection of the writer pool. Do not open another writing transaction while holding one. Reading
+            connections do not start an explicit transaction, so each of their statements sees its own snapshot.
+        server_id : Optional[int] = None
+            If given for a writing transaction, the connection is additionally guarded by a lock for this server, so
+            that handlers of the same server do not interleave, while other servers are not blocked.
+        """
+        # this runs for every DB access, so skip formatting the debug messages and timing the lock when not needed
+        debug: bool = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f'requesting connection with {locked=}, {server_id=}')
+        if locked and server_id is not None:
+            start_time = time.monotonic() if debug else 0
+            async with self._server_locks[server_id]:
+                if debug:
+                    logger.debug(f'Waited {time.monotonic() - start_time:.4f} seconds for lock of server {server_id}')
+                async with self.__transaction(immediate=True) as connection:
                     yield connection
         else:
-            async with self.__SQL_ENGINE.begin() as connection:
+            async with self.__transaction(immediate=locked) as connection:
                 yield connection
-        logger.debug(f'connection done')
+        if debug:
+            logger.debug('connection done')
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @tasks.loop(seconds=1)
+    async def flush_dirty_configs(self) -> None:
+        """
+        Writes all server configs changed by the word chain since the last run to the DB in a single transaction.
+
+        The word chain only marks configs as dirty in `self._dirty_configs` instead of writing them on every message.
+        """
+        if not self._dirty_configs:
+            return
+
+        server_ids, self._dirty_configs = self._dirty_configs, set()
+        try:
+            # configs of servers that were removed in the meantime are skipped
+            parameters: list[dict] = [self.server_configs[server_id].update_parameters()
+                                      for server_id in server_ids if server_id in self.server_configs]
+            if parameters:
+                async with self.db_connection() as connection:
+                    # a single executemany of the shared UPDATE statement
+                    await connection.execute(UPDATE_SERVER_CONFIG, parameters)
+                    await connection.commit()
+        except Exception as ex:
+            # try again on the next run instead of losing the changes
+            self._dirty_configs |= server_ids
+            logger.error(f'Failed to write {len(server_ids)} server configs to the DB:\n{ex}')
+        except BaseException:
+            # cancelled by close(), which writes the configs itself afterwards
+            self._dirty_configs |= server_ids
+            raise
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @tasks.loop(seconds=5)
+    async def flush_cached_words(self) -> None:
+        """
+        Writes all words added to the word cache since the last run to the DB in a single transaction.
+
+        `add_to_cache` only collects the words in `self._pending_cached_words` instead of inserting them one by one.
+        """
+        if not self._pending_cached_words:
+            return
+
+        words, self._pending_cached_words = self._pending_cached_words, set()
+        try:
+            async with self.db_connection() as connection:
+                await connection.execute(self.__INSERT_CACHED_WORD, [{'word': word} for word in words])
+                await connection.commit()
+        except Exception as ex:
+            # try again on the next run instead of losing the words
+            self._pending_cached_words |= words
+            logger.error(f'Failed to write {len(words)} words to the word cache:\n{ex}')
+        except BaseException:
+            # cancelled by close(), which writes the words itself afterwards
+            self._pending_cached_words |= words
+            raise
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @tasks.loop(seconds=60)
+    async def update_reliable_roles(self) -> None:
+        """
+        Adds/removes the reliable role in all servers where members have played since the last run.
+
+        The word chain only marks servers in `self._reliable_role_dirty` instead of checking the role on every message.
+        """
+        server_ids, self._reliable_role_dirty = self._reliable_role_dirty, set()
+        for server_id in server_ids:
+            guild: Optional[discord.Guild] = self.get_guild(server_id)
+            if guild is None:
+                continue
+            try:
+                await self.add_remove_reliable_role(guild)
+            except Exception as ex:
+                logger.error(f'Failed to update the reliable role in server {server_id}:\n{ex}')
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    async def close(self) -> None:
+        """Override the close method to write pending server configs and words and close the HTTP session."""
+        loops = (self.flush_dirty_configs, self.flush_cached_words, self.update_reliable_roles)
+        running_tasks = [task for loop in loops if (task := loop.get_task()) is not None and not task.done()]
+        for loop in loops:
+            loop.cancel()
+        if running_tasks:
+            # a cancelled flush puts its swapped set back, which must happen before the final flush below
+            await asyncio.wait(running_tasks)
+        await self.flush_dirty_configs()
+        await self.flush_cached_words()
+        if self._http_session:
+            await self._http_session.close()
+        await super().close()
 
     # ---------------------------------------------------------------------------------------------------------------
 
@@ -81,15 +272,21 @@ class Bot(commands.AutoShardedBot):
 
         # load all configs and make sure each guild has one entry
         async with self.db_connection() as connection:
+            await self.load_word_lists(connection)
+            await self.load_word_cache_filter(connection)
+
             stmt = select(ServerConfigModel)
             result: CursorResult = await connection.execute(stmt)
-            configs = [ServerConfig.model_validate(row) for row in result]
-            self.server_configs = {config.server_id: config for config in configs}
+            # on a reconnect, the configs in memory are kept, as they may hold changes that were not flushed yet
+            # the rows come from our own schema, so the configs are constructed without validating them again
+            for row in result:
+                if row.server_id not in self.server_configs:
+                    self.server_configs[row.server_id] = ServerConfig.model_construct(**row._mapping)
 
-            db_servers = {config.server_id for config in configs}
             current_servers = {guild.id for guild in self.guilds}
 
-            servers_without_config = current_servers - db_servers  # those that do not have a config in the db
+            # those that do not have a config in the db
+            servers_without_config = current_servers - self.server_configs.keys()
 
             for server_id in servers_without_config:
                 new_config = ServerConfig(server_id=server_id)
@@ -145,6 +342,7 @@ class Bot(commands.AutoShardedBot):
         Sets the `self.server_failed_roles` and `self.server_reliable_roles` variables.
         """
         config = self.server_configs[guild.id]
+        self.server_failed_role_holders.pop(guild.id, None)
         if config.failed_role_id is not None:
             self.server_failed_roles[guild.id] = discord.utils.get(guild.roles, id=config.failed_role_id)
         else:
@@ -157,71 +355,182 @@ class Bot(commands.AutoShardedBot):
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    async def add_remove_reliable_role(self, guild: discord.Guild, connection: AsyncConnection):
+    def get_member_history(self, server_id: int, member_id: int) -> deque[str]:
+        """
+        Gets the history of the last words of a member, creating it if needed.
+
+        Each server keeps the histories of at most `HISTORY_MEMBERS_PER_SERVER` members. The history of the member
+        who has been inactive the longest is dropped first.
+
+        Parameters
+        ----------
+        server_id : int
+            The guild the member is playing in.
+        member_id : int
+            The member whose history is requested.
+
+        Returns
+        -------
+        deque[str]
+            The last words of the member, bounded to `HISTORY_LENGTH` words.
+        """
+        member_histories: OrderedDict[int, deque[str]] = self._server_histories[server_id]
+        history: Optional[deque[str]] = member_histories.get(member_id)
+        if history is None:
+            history = member_histories[member_id] = deque(maxlen=HISTORY_LENGTH)
+            if len(member_histories) > HISTORY_MEMBERS_PER_SERVER:
+                member_histories.popitem(last=False)
+        else:
+            member_histories.move_to_end(member_id)
+        return history
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    async def update_member_stats(cls, connection: AsyncConnection, server_id: int, member_id: int,
+                                  score: int, correct: int, wrong: int, karma: float) -> None:
+        """
+        Adds the given changes to the stats of a member in a single upsert, which also creates the member if it is not
+        in the database yet. Karma does not drop below 0.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            The connection to execute the statement with.
+        server_id : int
+            The guild the member is playing in.
+        member_id : int
+            The member whose stats are updated.
+        score : int
+            Change of the score.
+        correct : int
+            Change of the number of correct words.
+        wrong : int
+            Change of the number of wrong words.
+        karma : float
+            Change of the karma.
+        """
+        await connection.execute(cls.__UPSERT_MEMBER_STATS, {
+            'filter_server_id': server_id,
+            'filter_member_id': member_id,
+            'score_change': score,
+            'correct_change': correct,
+            'wrong_change': wrong,
+            'karma_change': karma
+        })
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    async def change_role_members(role: discord.Role, add: Iterable[discord.Member] = (),
+                                  remove: Iterable[discord.Member] = ()) -> None:
+        """
+        Adds a role to and removes it from the given members. The requests are sent concurrently, but at most
+        `ROLE_UPDATE_CONCURRENCY` at a time. A failed request is logged and does not stop the others.
+
+        Parameters
+        ----------
+        role : discord.Role
+            The role to be added/removed.
+        add : Iterable[discord.Member] = ()
+            The members that should get the role.
+        remove : Iterable[discord.Member] = ()
+            The members that should lose the role.
+        """
+        semaphore = asyncio.Semaphore(ROLE_UPDATE_CONCURRENCY)
+
+        async def change(member: discord.Member, adding: bool) -> None:
+            async with semaphore:
+                if adding:
+                    await member.add_roles(role)
+                else:
+                    await member.remove_roles(role)
+
+        results = await asyncio.gather(*(change(member, True) for member in add),
+                                       *(change(member, False) for member in remove),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f'Failed to change the role {role.id}:\n{result}')
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    async def add_remove_reliable_role(self, guild: discord.Guild):
         """
         Adds/removes the reliable role if present to make sure it matches the rules.
 
         Criteria for getting the reliable role:
         1. Accuracy must be >= `RELIABLE_ROLE_ACCURACY_THRESHOLD`. (Accuracy = correct / (correct + wrong))
         2. Karma must be >= `RELIABLE_ROLE_KARMA_THRESHOLD`
+
+        The members are read with a connection of its own, which is returned to the pool before the role changes.
         """
         if self.server_reliable_roles[guild.id]:
+            # Members who left the server are not filtered out in SQL, since listing all current members could exceed
+            # the bind parameter limit of SQLite in large servers. They are skipped by `guild.get_member` below.
             stmt = select(MemberModel.member_id).where(
                 MemberModel.server_id == guild.id,
-                MemberModel.member_id.in_([member.id for member in guild.members]),
                 MemberModel.karma > RELIABLE_ROLE_KARMA_THRESHOLD,
                 (MemberModel.correct / (MemberModel.correct + MemberModel.wrong)) > RELIABLE_ROLE_ACCURACY_THRESHOLD
             )
-            result: CursorResult = await connection.execute(stmt)
-            db_members: set[int] = {row[0] for row in result}
+            async with self.db_connection(locked=False) as connection:
+                result: CursorResult = await connection.execute(stmt)
+                db_members: set[int] = {row[0] for row in result}
             role_members: set[int] = {member.id for member in self.server_reliable_roles[guild.id].members}
 
             only_db_members = db_members - role_members  # those that should have the role but do not
             only_role_members = role_members - db_members  # those that have the role but should not
 
-            for member_id in only_db_members:
-                member: Optional[discord.Member] = guild.get_member(member_id)
-                if member:
-                    await member.add_roles(self.server_reliable_roles[guild.id])
-
-            for member_id in only_role_members:
-                member: Optional[discord.Member] = guild.get_member(member_id)
-                if member:
-                    await member.remove_roles(self.server_reliable_roles[guild.id])
+            await self.change_role_members(
+                self.server_reliable_roles[guild.id],
+                add=[member for member_id in only_db_members if (member := guild.get_member(member_id))],
+                remove=[member for member_id in only_role_members if (member := guild.get_member(member_id))]
+            )
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    async def add_remove_failed_role(self, guild: discord.Guild, connection: AsyncConnection):
+    async def add_remove_failed_role(self, guild: discord.Guild):
         """
         Adds the `failed_role` to the user whose id is stored in `failed_member_id`.
         Removes the failed role from all other users.
         Does not proceed if failed role has not been set.
         If `failed_role` is not `None` but `failed_member_id` is `None`, then simply removes
         the failed role from all members who have it currently.
+        Returns early if the role was last handed to the current `failed_member_id` already.
+        Only sends Discord requests, so it must not be called while a write transaction is open.
         """
-        if self.server_failed_roles[guild.id]:
+        config: ServerConfig = self.server_configs[guild.id]
+        if guild.id in self.server_failed_role_holders and \
+                self.server_failed_role_holders[guild.id] == config.failed_member_id:
+            return
+
+        failed_role: Optional[discord.Role] = self.server_failed_roles[guild.id]
+        if failed_role:
             handled_member = False
-            for member in self.server_failed_roles[guild.id].members:
-                if self.server_configs[guild.id].failed_member_id == member.id:
+            members_to_remove: list[discord.Member] = []
+            for member in failed_role.members:
+                if config.failed_member_id == member.id:
                     # Current failed member already has the failed role, so just continue
                     handled_member = True
                     continue
                 else:
                     # Either failed_member_id is None, or this member is not the current failed member.
                     # In either case, we have to remove the role.
-                    await member.remove_roles(self.server_failed_roles[guild.id])
+                    members_to_remove.append(member)
+            await self.change_role_members(failed_role, remove=members_to_remove)
 
-            if not handled_member and self.server_configs[guild.id].failed_member_id:
+            if not handled_member and config.failed_member_id:
                 # Current failed member does not yet have the failed role
                 try:
-                    failed_member: discord.Member = await guild.fetch_member(
-                        self.server_configs[guild.id].failed_member_id)
-                    await failed_member.add_roles(self.server_failed_roles[guild.id])
+                    failed_member: discord.Member = await guild.fetch_member(config.failed_member_id)
+                    await failed_member.add_roles(failed_role)
                 except discord.NotFound:
                     # Member is no longer in the server
-                    self.server_configs[guild.id].failed_member_id = None
-                    self.server_configs[guild.id].correct_inputs_by_failed_member = 0
-                    await self.server_configs[guild.id].sync_to_db_with_connection(connection)
+                    config.failed_member_id = None
+                    config.correct_inputs_by_failed_member = 0
+                    self._dirty_configs.add(guild.id)
+
+            self.server_failed_role_holders[guild.id] = config.failed_member_id
 
     # ---------------------------------------------------------------------------------------------------------------
 
@@ -229,30 +538,32 @@ class Bot(commands.AutoShardedBot):
         """
         Hierarchy of checking:
         1. Word length must be > 1.
-        2. Is word whitelisted? --> If yes, skip to #5.
+        2. Is word whitelisted? --> If yes, skip to #4.
         3. Is the word blacklisted?
-        4. Is the word valid? (Check cache/start query if not found in cache)
-        5. Repetition?
+        4. Repetition?
+        5. Is the word valid? (Check cache/start query if not found in cache, skipped if whitelisted)
         6. Wrong member?
         7. Wrong starting letter?
         """
 
-        if message.author == self.user:
+        # direct messages have no guild, and no config either
+        if message.author == self.user or message.guild is None:
             return
 
         server_id = message.guild.id
 
         # Check if we have a config ready for this server
-        if server_id not in self.server_configs:
+        config: Optional[ServerConfig] = self.server_configs.get(server_id)
+        if config is None:
             return
 
         # Check if the message is in the channel
-        if message.channel.id != self.server_configs[server_id].channel_id:
+        if message.channel.id != config.channel_id:
             return
 
         word: str = message.content.lower()
 
-        if not all(c in POSSIBLE_CHARACTERS for c in word):
+        if not self.word_matches_pattern(word):
             return
         if len(word) == 0:
             return
@@ -261,247 +572,226 @@ class Bot(commands.AutoShardedBot):
         # Check word length
         # --------------------
         if len(word) == 1:
-            await message.add_reaction('⚠️')
-            await message.channel.send(f'''Single-letter inputs are no longer accepted.
+            await asyncio.gather(
+                message.add_reaction('⚠️'),
+                message.channel.send(f'''Single-letter inputs are no longer accepted.
 The chain has **not** been broken. Please enter another word.''')
+            )
             return
 
-        async with self.db_connection() as connection:
-            # ----------------------------------------------------------------------------------------
-            # ADD USER TO THE DATABASE
-            # ----------------------------------------------------------------------------------------
-            # We need to check whether the current user already has an entry in the database.
-            # If not, we have to add an entry.
-            stmt = select(exists(MemberModel).where(
-                MemberModel.member_id == message.author.id,
-                MemberModel.server_id == message.guild.id
-            ))
-            result: CursorResult = await connection.execute(stmt)
-            member_exists = result.scalar()
-
-            if not member_exists:
-                stmt = insert(MemberModel).values(
-                    server_id=message.guild.id,
-                    member_id=message.author.id,
-                    score=0,
-                    correct=0,
-                    wrong=0,
-                    karma=0.0
-                )
-                await connection.execute(stmt)
-                await connection.commit()
+        member_id: int = message.author.id
 
-        async with self.db_connection() as connection:
+        # Messages of the same server are handled one after the other, so the checks below see a consistent state
+        async with self._server_locks[server_id]:
             # -------------------------------
             # Check if word is whitelisted
             # -------------------------------
-            word_whitelisted: bool = await self.is_word_whitelisted(word, message.guild.id, connection)
+            word_whitelisted: bool = self.is_word_whitelisted(word, server_id)
 
             # -------------------------------
             # Check if word is blacklisted
             # (iff not whitelisted)
             # -------------------------------
-            if not word_whitelisted and await self.is_word_blacklisted(word, message.guild.id, connection):
-                await message.add_reaction('⚠️')
-                await message.channel.send(f'''This word has been **blacklisted**. Please do not use it.
+            if not word_whitelisted and self.is_word_blacklisted(word, server_id):
+                await asyncio.gather(
+                    message.add_reaction('⚠️'),
+                    message.channel.send(f'''This word has been **blacklisted**. Please do not use it.
 The chain has **not** been broken. Please enter another word.''')
+                )
+                return
+
+            # -----------------------------------
+            # Check repetitions
+            # (Repetitions are not mistakes)
+            # -----------------------------------
+            if word in self.server_used_words[server_id]:
+                await asyncio.gather(
+                    message.add_reaction('⚠️'),
+                    message.channel.send(f'''The word *{word}* has already been used before. \
+The chain has **not** been broken.
+Please enter another word.''')
+                )
                 return
 
             # ------------------------------
             # Check if word is valid
             # (if and only if not whitelisted)
             # ------------------------------
-            future: Optional[concurrent.futures.Future]
+            query_task: Optional[asyncio.Task[int]]
 
             # First check the whitelist or the word cache
-            if word_whitelisted or await self.is_word_in_cache(word, connection):
+            word_cached: bool = not word_whitelisted and await self.is_word_in_cache(word)
+            if word_whitelisted or word_cached:
                 # Word found in cache. No need to query API
-                future = None
+                query_task = None
             else:
                 # Word neither whitelisted, nor found in cache.
                 # Start the API request, but deal with it later
-                future = self.start_api_query(word)
+                query_task = asyncio.create_task(self.query_word(word))
 
-            # -----------------------------------
-            # Check repetitions
-            # (Repetitions are not mistakes)
-            # -----------------------------------
-            stmt = select(exists(UsedWordsModel).where(
-                UsedWordsModel.server_id == message.guild.id,
-                UsedWordsModel.word == word
-            ))
-            result: CursorResult = await connection.execute(stmt)
-            word_already_used = result.scalar()
-            if word_already_used:
-                await message.add_reaction('⚠️')
-                await message.channel.send(f'''The word *{word}* has already been used before. \
-The chain has **not** been broken.
-Please enter another word.''')
-                return
+            response: Optional[str] = None
 
             # -------------
             # Wrong member
             # -------------
-            if not SINGLE_PLAYER and self.server_configs[server_id].last_member_id == message.author.id:
-                response: str = f'''{message.author.mention} messed up the count! \
-*You cannot send two words in a row!*
-{f'The chain length was {self.server_configs[server_id].current_count} when it was broken. :sob:\n' if self.server_configs[server_id].current_count > 0 else ''}\
-Restart with a word starting with **{self.server_configs[server_id].current_word[-1]}** and \
-try to beat the current high score of **{self.server_configs[server_id].high_score}**!'''
-
-                await self.handle_mistake(message, response, connection)
-                await connection.commit()
-                return
+            if not SINGLE_PLAYER and config.last_member_id == member_id:
+                response = self.format_mistake_response(MISTAKE_TWO_WORDS_IN_A_ROW_MESSAGE,
+                                                        message.author.mention, config)
 
             # -------------------------
             # Wrong starting letter
             # -------------------------
-            if self.server_configs[server_id].current_word and word[0] != self.server_configs[server_id].current_word[
-                -1]:
-                response: str = f'''{message.author.mention} messed up the chain! \
-*The word you entered did not begin with the last letter of the previous word* (**{self.server_configs[server_id].current_word[-1]}**).
-{f'The chain length was {self.server_configs[server_id].current_count} when it was broken. :sob:\n' if self.server_configs[server_id].current_count > 0 else ''}\
-Restart with a word starting with **{self.server_configs[server_id].current_word[-1]}** and try to beat the \
-current high score of **{self.server_configs[server_id].high_score}**!'''
-
-                await self.handle_mistake(message, response, connection)
-                await connection.commit()
-                return
+            elif config.current_word and word[0] != config.current_word[-1]:
+                response = self.format_mistake_response(MISTAKE_WRONG_LETTER_MESSAGE, message.author.mention, config)
 
             # ----------------------------------
             # Check if word is valid (contd.)
             # ----------------------------------
-            if future:
-                result: int = self.get_query_response(future)
+            elif query_task:
+                result: int = await query_task
 
                 if result == bot.API_RESPONSE_WORD_DOESNT_EXIST:
 
-                    if self.server_configs[server_id].current_word:
-                        response: str = f'''{message.author.mention} messed up the chain! \
-*The word you entered does not exist.*
-{f'The chain length was {self.server_configs[server_id].current_count} when it was broken. :sob:\n' if self.server_configs[server_id].current_count > 0 else ''}\
-Restart with a word starting with **{self.server_configs[server_id].current_word[-1]}** and try to beat the \
-current high score of **{self.server_configs[server_id].high_score}**!'''
-
-                    else:
-                        response: str = f'''{message.author.mention} messed up the chain! \
-*The word you entered does not exist.*
-Restart and try to beat the current high score of **{self.server_configs[server_id].high_score}**!'''
-
-                    await self.handle_mistake(message, response, connection)
-                    await connection.commit()
-                    return
+                    response = self.format_mistake_response(MISTAKE_WORD_DOESNT_EXIST_MESSAGE,
+                                                            message.author.mention, config)
 
                 elif result == bot.API_RESPONSE_ERROR:
 
-                    await message.add_reaction('⚠️')
-                    await message.channel.send(''':octagonal_sign: There was an issue in the backend.
+                    await asyncio.gather(
+                        message.add_reaction('⚠️'),
+                        message.channel.send(''':octagonal_sign: There was an issue in the backend.
 The above entered word is **NOT** being taken into account.''')
+                    )
                     return
 
+            if response is not None and query_task:
+                # the chain is broken anyway, so the result of the query is not needed
+                query_task.cancel()
+
+            if response is not None:
+                await self.handle_mistake(message, response)
+                return
+
             # --------------------
             # Everything is fine
             # ---------------------
-            self.server_configs[server_id].update_current(member_id=message.author.id, current_word=word)
+            last_words: deque[str] = self.get_member_history(server_id, member_id)
+            karma: float = calculate_total_karma(word, last_words)
 
-            await message.add_reaction(
-                SPECIAL_REACTION_EMOJIS.get(word, self.server_configs[server_id].reaction_emoji()))
+            # All writes of this message go into a single transaction, which is committed before any Discord request
+            async with self.db_connection() as connection:
+                await self.update_member_stats(connection, server_id, member_id,
+                                               score=1, correct=1, wrong=0, karma=karma)
+                await connection.execute(self.__INSERT_USED_WORD, {'server_id': server_id, 'word': word})
+                await connection.commit()
 
-            last_words: deque[str] = self._server_histories[server_id][message.author.id]
-            karma: float = calculate_total_karma(word, last_words)
-            self._server_histories[server_id][message.author.id].append(word)
-
-            stmt = update(MemberModel).where(
-                MemberModel.server_id == message.guild.id,
-                MemberModel.member_id == message.author.id
-            ).values(
-                score=MemberModel.score + 1,
-                correct=MemberModel.correct + 1,
-                karma=func.max(0, MemberModel.karma + karma)
-            )
-            await connection.execute(stmt)
+            self.server_used_words[server_id].add(word)
+            last_words.append(word)
+            config.update_current(member_id=member_id, current_word=word)
 
-            stmt = insert(UsedWordsModel).values(
-                server_id=message.guild.id,
-                word=word
-            )
-            await connection.execute(stmt)
+            # Check and reset the server config.failed_member_id to None.
+            failed_member_recovered: bool = False
+            if config.failed_member_id == member_id and self.server_failed_roles[server_id]:
+                config.correct_inputs_by_failed_member += 1
+                if config.correct_inputs_by_failed_member >= 30:
+                    config.failed_member_id = None
+                    config.correct_inputs_by_failed_member = 0
+                    failed_member_recovered = True
+
+            if not word_cached:
+                # whitelisted words skipped the blacklist check, but must not be cached if globally blacklisted
+                self.add_to_cache(word, already_checked=not word_whitelisted)
+            self._reliable_role_dirty.add(server_id)
+            self._dirty_configs.add(server_id)
 
-            current_count = self.server_configs[server_id].current_count
+            await message.add_reaction(SPECIAL_REACTION_EMOJIS.get(word) or config.reaction_emoji())
+
+            current_count = config.current_count
 
             if current_count > 0 and current_count % 100 == 0:
                 await message.channel.send(f'{current_count} words! Nice work, keep it up!')
 
-            # Check and reset the server config.failed_member_id to None.
-            if self.server_failed_roles[server_id] and self.server_configs[
-                server_id].failed_member_id == message.author.id:
-                self.server_configs[server_id].correct_inputs_by_failed_member += 1
-                if self.server_configs[server_id].correct_inputs_by_failed_member >= 30:
-                    self.server_configs[server_id].failed_member_id = None
-                    self.server_configs[server_id].correct_inputs_by_failed_member = 0
-                    await self.add_remove_failed_role(message.guild, connection)
-
-            await self.add_to_cache(word, connection)
-            await self.add_remove_reliable_role(message.guild, connection)
-            await self.server_configs[server_id].sync_to_db_with_connection(connection)
+            if failed_member_recovered:
+                await self.add_remove_failed_role(message.guild)
 
-            await connection.commit()
+    # ---------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def format_mistake_response(template: str, mention: str, config: ServerConfig) -> str:
+        """
+        Builds the response to a mistake from one of the `MISTAKE_*_MESSAGE` templates for the reason, followed by
+        the length of the broken chain and the request to restart.
+
+        Parameters
+        ----------
+        template : str
+            The template for the reason, may use `{mention}` and `{letter}`.
+        mention : str
+            The mention of the member who made the mistake.
+        config : ServerConfig
+            The config of the server, before the chain is reset.
+
+        Returns
+        -------
+        str
+            The response to be sent to the channel.
+        """
+        if config.current_word:
+            letter: str = config.current_word[-1]
+            restart: str = MISTAKE_RESTART_WITH_LETTER_MESSAGE.format(letter=letter, high_score=config.high_score)
+        else:
+            letter = ''
+            restart = MISTAKE_RESTART_MESSAGE.format(high_score=config.high_score)
+        chain_length: str = MISTAKE_CHAIN_LENGTH_MESSAGE.format(count=config.current_count) \
+            if config.current_count > 0 else ''
+        return f'{template.format(mention=mention, letter=letter)}\n{chain_length}{restart}'
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    async def handle_mistake(self, message: discord.Message,
-                             response: str, connection: AsyncConnection) -> None:
+    async def handle_mistake(self, message: discord.Message, response: str) -> None:
         """Handles when someone messes up the count with a wrong number"""
 
         server_id = message.guild.id
         member_id = message.author.id
-        if self.server_failed_roles[server_id]:
-            self.server_configs[server_id].failed_member_id = member_id  # Designate current user as failed member
-            await self.add_remove_failed_role(message.guild, connection)
-
-        self.server_configs[server_id].fail_chain(member_id)
+        config = self.server_configs[server_id]
 
-        await message.channel.send(response)
-        await message.add_reaction('❌')
+        async with self.db_connection() as connection:
+            await self.update_member_stats(connection, server_id, member_id,
+                                           score=-1, correct=0, wrong=1, karma=-MISTAKE_PENALTY)
+            await connection.execute(self.__DELETE_USED_WORDS, {'filter_server_id': server_id})
+            await connection.commit()
 
-        stmt = update(MemberModel).where(
-            MemberModel.server_id == server_id,
-            MemberModel.member_id == member_id
-        ).values(
-            score=MemberModel.score - 1,
-            wrong=MemberModel.wrong + 1,
-            karma=func.max(0, MemberModel.karma - MISTAKE_PENALTY)
-        )
-        await connection.execute(stmt)
+        # only forget the used words once they are gone from the DB as well
+        self.server_used_words.pop(server_id, None)
 
-        stmt = delete(UsedWordsModel).where(
-            UsedWordsModel.server_id == server_id
-        )
-        await connection.execute(stmt)
+        config.fail_chain(member_id)  # Designates current user as failed member
+        self._dirty_configs.add(server_id)
 
-        await self.server_configs[server_id].sync_to_db_with_connection(connection)
+        await asyncio.gather(message.channel.send(response), message.add_reaction('❌'))
 
+        if self.server_failed_roles[server_id]:
+            await self.add_remove_failed_role(message.guild)
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    @staticmethod
-    def start_api_query(word: str) -> concurrent.futures.Future:
+    async def query_word(self, word: str) -> int:
         """
-        Starts a Wiktionary API query in the background to find the given word.
+        Queries the Wiktionary API to find the given word.
+
+        All queries share the HTTP session of the bot, so connections are reused between queries.
 
         Parameters
         ----------
         word : str
-             The word to be searched for.
+             The lowercase word to be searched for.
 
         Returns
         -------
-        concurrent.futures.Future
-              A Futures object for the API query.
+        int
+            `bot.API_RESPONSE_WORD_EXISTS` is the word exists, `bot.API_RESPONSE_WORD_DOESNT_EXIST` if the word
+            does not exist, or `bot.API_RESPONSE_ERROR` if an error (of any type) was raised in the query.
         """
 
-        session: FuturesSession = FuturesSession()
-
         url: str = "https://en.wiktionary.org/w/api.php"
         params: dict = {
             "action": "opensearch",
@@ -512,39 +802,17 @@ The above entered word is **NOT** being taken into account.''')
             "profile": "strict"
         }
 
-        return session.get(url=url, params=params)
-
-    # ---------------------------------------------------------------------------------------------------------------
-
-    @staticmethod
-    def get_query_response(future: concurrent.futures.Future) -> int:
-        """
-        Get the result of a query that was started in the background.
-
-        Parameters
-        ----------
-        future : concurrent.futures.Future
-            The Future object corresponding to the started API query.
-
-        Returns
-        -------
-        int
-            `bot.API_RESPONSE_WORD_EXISTS` is the word exists, `bot.API_RESPONSE_WORD_DOESNT_EXIST` if the word
-            does not exist, or `bot.API_RESPONSE_ERROR` if an error (of any type) was raised in the query.
-        """
         try:
-            response = future.result(timeout=5)
-
-            if response.status_code >= 400:
-                logger.error(f'Received status code {response.status_code} from Wiktionary API query.')
-                return bot.API_RESPONSE_ERROR
+            async with self._http_session.get(url, params=params) as response:
+                if response.status >= 400:
+                    logger.error(f'Received status code {response.status} from Wiktionary API query.')
+                    return bot.API_RESPONSE_ERROR
 
-            data = response.json()
+                data = await response.json()
 
-            word: str = data[0]
             best_match: str = data[1][0]  # Should raise an IndexError if no match is returned
 
-            if best_match.lower() == word.lower():
+            if best_match.lower() == word:
                 return bot.API_RESPONSE_WORD_EXISTS
             else:
                 # Normally, the control should not reach this else statement.
@@ -569,23 +837,24 @@ The above entered word is **NOT** being taken into account.''')
         if not self.is_ready():
             return
 
-        if message.author == self.user:
+        if message.author == self.user or message.guild is None:
             return
 
+        config: Optional[ServerConfig] = self.server_configs.get(message.guild.id)
+
         # Check if the message is in the channel
-        if message.channel.id != self.server_configs[message.guild.id].channel_id:
+        if config is None or message.channel.id != config.channel_id:
             return
         if not message.reactions:
             return
-        if not all(c in POSSIBLE_CHARACTERS for c in message.content.lower()):
+        if not self.word_matches_pattern(message.content.lower()):
             return
 
-        if self.server_configs[message.guild.id].current_word:
+        if config.current_word:
             await message.channel.send(
-                f'{message.author.mention} deleted their word! '
-                f'The **last** word was **{self.server_configs[message.guild.id].current_word}**.')
+                WORD_DELETED_WITH_LAST_WORD_MESSAGE.format(mention=message.author.mention, word=config.current_word))
         else:
-            await message.channel.send(f'{message.author.mention} deleted their word!')
+            await message.channel.send(WORD_DELETED_MESSAGE.format(mention=message.author.mention))
 
     # ---------------------------------------------------------------------------------------------------------------
 
@@ -595,67 +864,166 @@ The above entered word is **NOT** being taken into account.''')
         if not self.is_ready():
             return
 
-        if before.author == self.user:
+        if before.author == self.user or before.guild is None:
             return
 
+        config: Optional[ServerConfig] = self.server_configs.get(before.guild.id)
+
         # Check if the message is in the channel
-        if before.channel.id != self.server_configs[before.guild.id].channel_id:
+        if config is None or before.channel.id != config.channel_id:
             return
         if not before.reactions:
             return
-        if not all(c in POSSIBLE_CHARACTERS for c in before.content.lower()):
+
+        word_before: str = before.content.lower()
+        if not self.word_matches_pattern(word_before):
             return
-        if before.content.lower() == after.content.lower():
+        if word_before == after.content.lower():
             return
 
-        if self.server_configs[before.guild.id].current_word:
+        if config.current_word:
             await after.channel.send(
-                f'{after.author.mention} edited their word! '
-                f'The **last** word was **{self.server_configs[before.guild.id].current_word}**.')
+                WORD_EDITED_WITH_LAST_WORD_MESSAGE.format(mention=after.author.mention, word=config.current_word))
         else:
-            await after.channel.send(f'{after.author.mention} edited their word!')
+            await after.channel.send(WORD_EDITED_MESSAGE.format(mention=after.author.mention))
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    @staticmethod
-    async def is_word_in_cache(word: str, connection: AsyncConnection) -> bool:
+    @classmethod
+    def word_matches_pattern(cls, word: str) -> bool:
+        """
+        Checks if a word consists of legal characters only.
+
+        The set of legal characters is checked to be a superset of the word's characters, which runs entirely in C.
+
+        Parameters
+        ----------
+        word : str
+            The (lowercase) word to be checked.
+
+        Returns
+        -------
+        bool
+            `True` if all characters of the word are in `POSSIBLE_CHARACTERS`, otherwise `False`.
+        """
+        return cls.__LEGAL_CHARACTERS.issuperset(word)
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    async def is_word_in_cache(self, word: str, connection: Optional[AsyncConnection] = None) -> bool:
         """
         Check if a word is in the correct word cache schema.
 
         Note that if this returns `True`, then the word is definitely correct. But, if this returns `False`, it
         only means that the word does not yet exist in the schema. It does NOT mean that the word is wrong.
 
+        The most recently used words of the cache are also kept in memory, so they are found without a DB query.
+        Words that were never cached are mostly ruled out by a bloom filter, also without a DB query.
+
         Parameters
         ----------
         word : str
             The word to be searched for in the schema.
-        connection : AsyncConnection
-            The Cursor object to access the schema.
+        connection : Optional[AsyncConnection] = None
+            The Cursor object to access the schema. If not given, a reading connection is opened only if the DB has
+            to be queried.
 
         Returns
         -------
         bool
             `True` if the word exists in the cache, otherwise `False`.
         """
-        stmt = select(exists(WordCacheModel).where(WordCacheModel.word == word))
-        result: CursorResult = await connection.execute(stmt)
-        return result.scalar()
+        cached: Optional[bool] = self.__is_word_in_cache_memory(word)
+        if cached is not None:
+            return cached
+
+        if connection is None:
+            async with self.db_connection(locked=False) as connection:
+                return await self.is_word_in_cache(word, connection)
+
+        if await connection.scalar(self.__CACHED_WORD_EXISTS, {'filter_word': word}) is not None:
+            self.__remember_cached_word(word)
+            return True
+        return False
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    async def add_to_cache(self, word: str, connection: AsyncConnection) -> None:
+    def __is_word_in_cache_memory(self, word: str) -> Optional[bool]:
+        # True for recently used words of the cache, False for words the bloom filter rules out, None if unknown
+        if word in self._recent_cached_words:
+            self._recent_cached_words.move_to_end(word)
+            return True
+        if self._word_cache_filter is not None and word not in self._word_cache_filter:
+            return False
+        return None
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def __remember_cached_word(self, word: str) -> None:
+        self._recent_cached_words[word] = None
+        self._recent_cached_words.move_to_end(word)
+        if len(self._recent_cached_words) > WORD_CACHE_MEMORY_SIZE:
+            self._recent_cached_words.popitem(last=False)
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def add_to_cache(self, word: str, already_checked: bool = False) -> None:
         """
         Add a word into the `bot.TABLE_CACHE` schema.
+
+        The word is known to be in the cache right away, but it is written to the DB by `flush_cached_words` later.
+
+        Parameters
+        ----------
+        word : str
+            The word to be added to the cache.
+        already_checked : bool = False
+            `True` if the caller has just checked the word with `is_word_blacklisted`, which makes the check of the
+            global blacklists here redundant. Default: `False`.
         """
-        if not await self.is_word_blacklisted(word):  # Do NOT insert globally blacklisted words into the cache
-            stmt = insert(WordCacheModel).values(word=word).prefix_with('OR IGNORE')
-            await connection.execute(stmt)
+        if word in self._recent_cached_words:
+            # already in the cache, no need to write it again
+            self._recent_cached_words.move_to_end(word)
+            return
+
+        # Do NOT insert globally blacklisted words into the cache
+        if already_checked or not self.is_word_globally_blacklisted(word):
+            self._pending_cached_words.add(word)
+            if self._word_cache_filter is not None:
+                self._word_cache_filter.add(word)
+            self.__remember_cached_word(word)
 
     # ---------------------------------------------------------------------------------------------------------------
 
     @staticmethod
-    async def is_word_blacklisted(word: str, server_id: Optional[int] = None,
-                                  connection: Optional[AsyncConnection] = None) -> bool:
+    def is_word_globally_blacklisted(word: str) -> bool:
+        """
+        Checks if a word is blacklisted by the global blacklists/whitelists.
+
+        Unlike `is_word_blacklisted`, this does not need a server.
+
+        Parameters
+        ----------
+        word : str
+            The word that is to be checked.
+
+        Returns
+        -------
+        bool
+            `True` if the word is globally blacklisted, otherwise `False`.
+        """
+        word_length: int = len(word)
+
+        # Check global 3-letter words WHITElist first, it decides about most 3-letter words on its own
+        if word_length == 3 and word not in GLOBAL_WHITELIST_3_LETTER_WORDS:
+            return True
+
+        # Check global blacklists
+        return word in GLOBAL_BLACKLIST_WORDS_BY_LENGTH.get(word_length, ())
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    def is_word_blacklisted(self, word: str, server_id: Optional[int] = None) -> bool:
         """
         Checks if a word is blacklisted.
 
@@ -663,7 +1031,7 @@ The above entered word is **NOT** being taken into account.''')
         1. Global blacklists/whitelists, THEN
         2. Server blacklist.
 
-        Do not pass the `server_id` or `connection` instance if you want to query the global blacklists only.
+        Do not pass the `server_id` if you want to query the global blacklists only.
 
         Parameters
         ----------
@@ -671,8 +1039,6 @@ The above entered word is **NOT** being taken into account.''')
             The word that is to be checked.
         server_id : Optional[int] = None
             The guild which is calling this function. Default: `None`.
-        connection : Optional[AsyncConnection] = None
-            An instance of AsyncConnection through which the DB will be accessed. Default: `None`.
 
         Returns
         -------
@@ -680,31 +1046,21 @@ The above entered word is **NOT** being taken into account.''')
             `True` if the word is blacklisted, otherwise `False`.
         """
         # Check global blacklists
-        if word in GLOBAL_BLACKLIST_2_LETTER_WORDS or word in GLOBAL_BLACKLIST_N_LETTER_WORDS:
+        if self.is_word_globally_blacklisted(word):
             return True
 
-        # Check global 3-letter words WHITElist
-        if len(word) == 3 and word not in GLOBAL_WHITELIST_3_LETTER_WORDS:
-            return True
-
-        # Either of these two params being null implies only the global blacklists should be checked
-        if server_id is None or connection is None:
+        # A null server_id implies only the global blacklists should be checked
+        if server_id is None:
             # Global blacklists have already been checked. If the control is here, it means that
             # the word is not globally blacklisted. So, return False.
             return False
 
         # Check server blacklist
-        stmt = select(exists(BlacklistModel).where(
-            BlacklistModel.server_id == server_id,
-            BlacklistModel.word == word
-        ))
-        result: CursorResult = await connection.execute(stmt)
-        return result.scalar()
+        return word in self.server_blacklists[server_id]
 
     # ---------------------------------------------------------------------------------------------------------------
 
-    @staticmethod
-    async def is_word_whitelisted(word: str, server_id: int, connection: AsyncConnection) -> bool:
+    def is_word_whitelisted(self, word: str, server_id: int) -> bool:
         """
         Checks if a word is whitelisted.
 
@@ -716,8 +1072,6 @@ The above entered word is **NOT** being taken into account.''')
             The word that is to be checked.
         server_id : int
             The guild which is calling this function.
-        connection : AsyncConnection
-            An instance of AsyncConnection through which the DB will be accessed.
 
         Returns
         -------
@@ -725,24 +1079,88 @@ The above entered word is **NOT** being taken into account.''')
             `True` if the word is whitelisted, otherwise `False`.
         """
         # Check server whitelisted
-        stmt = select(exists(WhitelistModel).where(
-            WhitelistModel.server_id == server_id,
-            WhitelistModel.word == word
-        ))
-        result: CursorResult = await connection.execute(stmt)
-        return result.scalar()
+        return word in self.server_whitelists[server_id]
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    async def load_word_lists(self, connection: AsyncConnection) -> None:
+        """
+        Loads the blacklists, whitelists and used words of all servers from the DB into `self.server_blacklists`,
+        `self.server_whitelists` and `self.server_used_words`. The commands changing these lists and the word chain
+        keep them up to date afterward.
+        """
+        server_blacklists: dict[int, set[str]] = defaultdict(set)
+        result: CursorResult = await connection.execute(select(BlacklistModel.server_id, BlacklistModel.word))
+        for server_id, word in result:
+            server_blacklists[server_id].add(word)
+
+        server_whitelists: dict[int, set[str]] = defaultdict(set)
+        result: CursorResult = await connection.execute(select(WhitelistModel.server_id, WhitelistModel.word))
+        for server_id, word in result:
+            server_whitelists[server_id].add(word)
+
+        server_used_words: dict[int, set[str]] = defaultdict(set)
+        result: CursorResult = await connection.execute(select(UsedWordsModel.server_id, UsedWordsModel.word))
+        for server_id, word in result:
+            server_used_words[server_id].add(word)
+
+        self.server_blacklists = server_blacklists
+        self.server_whitelists = server_whitelists
+        self.server_used_words = server_used_words
+
+    # ---------------------------------------------------------------------------------------------------------------
+
+    async def load_word_cache_filter(self, connection: AsyncConnection) -> None:
+        """
+        Builds the bloom filter over all words of the word cache, sized for twice the current amount of words (but
+        at least `WORD_CACHE_FILTER_MIN_CAPACITY`) to leave room for new words. `add_to_cache` keeps it up to date.
+        """
+        word_count: int = await connection.scalar(select(count()).select_from(WordCacheModel))
+        word_filter = BloomFilter(max(2 * word_count, WORD_CACHE_FILTER_MIN_CAPACITY), WORD_CACHE_FILTER_ERROR_RATE)
+
+        result: CursorResult = await connection.execute(select(WordCacheModel.word))
+        for (word,) in result:
+            word_filter.add(word)
+        for word in self._pending_cached_words:
+            word_filter.add(word)
+
+        self._word_cache_filter = word_filter
 
     # ---------------------------------------------------------------------------------------------------------------
 
     async def setup_hook(self) -> None:
+        # keep the connection to Wiktionary open between queries, uncached words come in at irregular intervals
+        self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5),
+                                                   connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300,
+                                                                                  keepalive_timeout=60))
+        self.flush_dirty_configs.start()
+        self.flush_cached_words.start()
+        self.update_reliable_roles.start()
+
         if not DEV_MODE:
             # only sync when not in dev mode to avoid syncing over and over again - use sync command explicitly
-            global_sync = await self.tree.sync()
-            admin_sync = await self.tree.sync(guild=discord.Object(id=ADMIN_GUILD_ID))
+            global_sync, admin_sync = await asyncio.gather(self.tree.sync(),
+                                                           self.tree.sync(guild=discord.Object(id=ADMIN_GUILD_ID)))
             logger.info(f'Synchronized {len(global_sync)} global commands and {len(admin_sync)} admin commands')
 
+        # only start the migration environment if the DB is not on the latest revision already
         alembic_cfg = AlembicConfig('alembic.ini')
-        alembic_command.upgrade(alembic_cfg, 'head')
+        head_revision: Optional[str] = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+        async with self.db_connection(locked=False) as connection:
+            db_revision: Optional[str] = await connection.run_sync(
+                lambda sync_connection: MigrationContext.configure(sync_connection).get_current_revision())
+        if db_revision != head_revision:
+            logger.info(f'Upgrading the DB from revision {db_revision} to {head_revision}')
+            alembic_command.upgrade(alembic_cfg, 'head')
+
+        async with self.db_connection(locked=False) as connection:
+            result: CursorResult = await connection.execute(
+                select(column('name')).select_from(table('sqlite_master')).where(column('type') == 'trigger'))
+            missing_triggers: set[str] = GLOBAL_MEMBER_TOTAL_TRIGGERS - {row[0] for row in result}
+        if missing_triggers:
+            # a batch migration of the member table recreates it without the triggers of 7d4b2e91c6a8
+            logger.error(f'The DB is missing the triggers {sorted(missing_triggers)}, the global leaderboards will '
+                         f'not be updated. The migration that recreated the member table has to create them again.')
 
 bot = Bot()
 
@@ -750,12 +1168,32 @@ bot = Bot()
 @bot.tree.command(name='sync', description='Syncs the slash commands to the bot')
 @app_commands.guilds(ADMIN_GUILD_ID)
 @app_commands.default_permissions(ban_members=True)
-async def sync(interaction: discord.Interaction):
-    """Sync all the slash commands to the bot"""
+@app_commands.describe(scope='Sync only the global or only the admin commands, default: both')
+@app_commands.choices(scope=[
+    app_commands.Choice(name='all', value='all'),
+    app_commands.Choice(name='global', value='global'),
+    app_commands.Choice(name='admin', value='admin')
+])
+async def sync(interaction: discord.Interaction, scope: Optional[app_commands.Choice[str]]):
+    """Sync the slash commands to the bot"""
     await interaction.response.defer()
-    global_sync = await bot.tree.sync()
-    admin_sync = await bot.tree.sync(guild=discord.Object(id=ADMIN_GUILD_ID))
-    await interaction.followup.send(f'Synchronized {len(global_sync)} global commands and {len(admin_sync)} admin commands')
+
+    sync_scope: str = 'all' if scope is None else scope.value
+
+    match sync_scope:
+        case 'all':
+            global_sync, admin_sync = await asyncio.gather(bot.tree.sync(),
+                                                           bot.tree.sync(guild=discord.Object(id=ADMIN_GUILD_ID)))
+            await interaction.followup.send(f'Synchronized {len(global_sync)} global commands and '
+                                            f'{len(admin_sync)} admin commands')
+        case 'global':
+            global_sync = await bot.tree.sync()
+            await interaction.followup.send(f'Synchronized {len(global_sync)} global commands')
+        case 'admin':
+            admin_sync = await bot.tree.sync(guild=discord.Object(id=ADMIN_GUILD_ID))
+            await interaction.followup.send(f'Synchronized {len(admin_sync)} admin commands')
+        case _:
+            raise ValueError(f'Unknown scope {sync_scope}')
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -772,7 +1210,8 @@ async def clean_server(interaction: discord.Interaction, guild_id: str):
         await interaction.response.send_message('This is not a valid ID!')
         return
 
-    async with bot.db_connection() as connection:
+    # the lock of the server keeps the word chain of that server from running in between
+    async with bot.db_connection(server_id=guild_id_as_number) as connection:
         total_rows_changed = 0
 
         # delete used words
@@ -817,11 +1256,15 @@ async def clean_server(interaction: discord.Interaction, guild_id: str):
             total_rows_changed += result.rowcount
 
         await connection.commit()
+        # the word lists in memory are only dropped once they are gone from the DB as well
+        bot.server_used_words.pop(guild_id_as_number, None)
+        bot.server_blacklists.pop(guild_id_as_number, None)
+        bot.server_whitelists.pop(guild_id_as_number, None)
 
-        if total_rows_changed > 0:
-            await interaction.response.send_message(f'Removed data for server {guild_id_as_number}')
-        else:
-            await interaction.response.send_message(f'No data to remove for server {guild_id_as_number}')
+    if total_rows_changed > 0:
+        await interaction.response.send_message(f'Removed data for server {guild_id_as_number}')
+    else:
+        await interaction.response.send_message(f'No data to remove for server {guild_id_as_number}')
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -843,10 +1286,11 @@ async def clean_user(interaction: discord.Interaction, user_id: str):
         result = await connection.execute(stmt)
         await connection.commit()
         rows_deleted: int = result.rowcount
-        if rows_deleted > 0:
-            await interaction.response.send_message(f'Removed data for user {user_id_as_number} in {rows_deleted} servers')
-        else:
-            await interaction.response.send_message(f'No data to remove for user {user_id_as_number}')
+
+    if rows_deleted > 0:
+        await interaction.response.send_message(f'Removed data for user {user_id_as_number} in {rows_deleted} servers')
+    else:
+        await interaction.response.send_message(f'No data to remove for user {user_id_as_number}')
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -916,7 +1360,9 @@ async def check_word(interaction: discord.Interaction, word: str):
 
     emb = discord.Embed(color=discord.Color.blurple())
 
-    if not all(c in POSSIBLE_CHARACTERS for c in word.lower()):
+    word_lowercase: str = word.lower()
+
+    if not bot.word_matches_pattern(word_lowercase):
         emb.description = f'❌ **{word}** is **not** a legal word.'
         await interaction.followup.send(embed=emb)
         return
@@ -926,39 +1372,38 @@ async def check_word(interaction: discord.Interaction, word: str):
         await interaction.followup.send(embed=emb)
         return
 
-    word = word.lower()
-
-    async with bot.db_connection() as connection:
-        if await bot.is_word_whitelisted(word, interaction.guild.id, connection):
-            emb.description = f'✅ The word **{word}** is valid.'
-            await interaction.followup.send(embed=emb)
-            return
+    word = word_lowercase
 
-        if await bot.is_word_blacklisted(word, interaction.guild.id, connection):
-            emb.description = f'❌ The word **{word}** is **blacklisted** and hence, **not** valid.'
-            await interaction.followup.send(embed=emb)
-            return
+    if bot.is_word_whitelisted(word, interaction.guild.id):
+        emb.description = f'✅ The word **{word}** is valid.'
+        await interaction.followup.send(embed=emb)
+        return
 
-        if await bot.is_word_in_cache(word, connection):
-            emb.description = f'✅ The word **{word}** is valid.'
-            await interaction.followup.send(embed=emb)
-            return
+    if bot.is_word_blacklisted(word, interaction.guild.id):
+        emb.description = f'❌ The word **{word}** is **blacklisted** and hence, **not** valid.'
+        await interaction.followup.send(embed=emb)
+        return
 
-        future: concurrent.futures.Future = bot.start_api_query(word)
+    # the cache opens a read connection only if its in-memory checks are inconclusive, so none is held while the
+    # API is queried
+    if await bot.is_word_in_cache(word):
+        emb.description = f'✅ The word **{word}** is valid.'
+        await interaction.followup.send(embed=emb)
+        return
 
-        match bot.get_query_response(future):
-            case bot.API_RESPONSE_WORD_EXISTS:
+    match await bot.query_word(word):
+        case bot.API_RESPONSE_WORD_EXISTS:
 
-                emb.description = f'✅ The word **{word}** is valid.'
+            emb.description = f'✅ The word **{word}** is valid.'
 
-                await bot.add_to_cache(word, connection)
+            bot.add_to_cache(word, already_checked=True)
 
-            case bot.API_RESPONSE_WORD_DOESNT_EXIST:
-                emb.description = f'❌ **{word}** is **not** a valid word.'
-            case _:
-                emb.description = f'⚠️ There was an issue in fetching the result.'
+        case bot.API_RESPONSE_WORD_DOESNT_EXIST:
+            emb.description = f'❌ **{word}** is **not** a valid word.'
+        case _:
+            emb.description = f'⚠️ There was an issue in fetching the result.'
 
-        await interaction.followup.send(embed=emb)
+    await interaction.followup.send(embed=emb)
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -971,12 +1416,15 @@ async def set_failed_role(interaction: discord.Interaction, role: discord.Role):
     """Command to set the role to be used when a user fails to count"""
     guild_id = interaction.guild.id
     bot.server_configs[guild_id].failed_role_id = role.id
-    async with bot.db_connection() as connection:
+    async with bot.db_connection(server_id=guild_id) as connection:
         await bot.server_configs[guild_id].sync_to_db_with_connection(connection)
-        bot.server_failed_roles[guild_id] = role  # Assign role directly if we already have it in this context
-        await bot.add_remove_failed_role(interaction.guild, connection)
         await connection.commit()
-        await interaction.response.send_message(f'Failed role was set to {role.mention}')
+        bot.server_failed_roles[guild_id] = role  # Assign role directly if we already have it in this context
+        bot.server_failed_role_holders.pop(guild_id, None)
+
+    # the role changes are sent after the commit, so the writer connection is not held during them
+    await bot.add_remove_failed_role(interaction.guild)
+    await interaction.response.send_message(f'Failed role was set to {role.mention}')
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -989,12 +1437,14 @@ async def set_reliable_role(interaction: discord.Interaction, role: discord.Role
     """Command to set the role to be used when a user gets 100 of score"""
     guild_id = interaction.guild.id
     bot.server_configs[guild_id].reliable_role_id = role.id
-    async with bot.db_connection() as connection:
+    async with bot.db_connection(server_id=guild_id) as connection:
         await bot.server_configs[guild_id].sync_to_db_with_connection(connection)
-        bot.server_reliable_roles[guild_id] = role  # Assign role directly if we already have it in this context
-        await bot.add_remove_reliable_role(interaction.guild, connection)
         await connection.commit()
-        await interaction.response.send_message(f'Reliable role was set to {role.mention}')
+        bot.server_reliable_roles[guild_id] = role  # Assign role directly if we already have it in this context
+
+    # the role changes are sent after the commit, so the writer connection is not held during them
+    await bot.add_remove_reliable_role(interaction.guild)
+    await interaction.response.send_message(f'Reliable role was set to {role.mention}')
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -1010,9 +1460,9 @@ async def remove_failed_role(interaction: discord.Interaction):
 
     if bot.server_failed_roles[guild_id]:
         role = bot.server_failed_roles[guild_id]
-        for member in role.members:
-            await member.remove_roles(role)
+        await bot.change_role_members(role, remove=role.members)
         bot.server_failed_roles[guild_id] = None
+        bot.server_failed_role_holders.pop(guild_id, None)
         await interaction.response.send_message('Failed role removed')
     else:
         await interaction.response.send_message('Failed role was already removed')
@@ -1029,8 +1479,7 @@ async def remove_reliable_role(interaction: discord.Interaction):
 
     if bot.server_reliable_roles[guild_id]:
         role = bot.server_reliable_roles[guild_id]
-        for member in role.members:
-            await member.remove_roles(role)
+        await bot.change_role_members(role, remove=role.members)
         bot.server_reliable_roles[guild_id] = None
         await interaction.response.send_message('Reliable role removed')
     else:
@@ -1079,6 +1528,25 @@ async def prune(interaction: discord.Interaction):
 
 class LeaderboardCmdGroup(app_commands.Group):
 
+    # statements of the leaderboards are built once, the values are bound on execution
+    __SERVER_USER_BOARDS = {
+        metric: select(MemberModel.member_id, field)
+        .where(MemberModel.server_id == bindparam('filter_server_id'))
+        .order_by(field.desc())
+        .limit(10)
+        for metric, field in (('score', MemberModel.score), ('karma', MemberModel.karma))
+    }
+    # the sums over all servers are kept up to date in the DB, so the global boards read the top rows of an index
+    __GLOBAL_USER_BOARDS = {
+        metric: select(GlobalMemberTotalModel.member_id, field)
+        .order_by(field.desc())
+        .limit(10)
+        for metric, field in (('score', GlobalMemberTotalModel.score), ('karma', GlobalMemberTotalModel.karma))
+    }
+    __SERVER_BOARD = (select(ServerConfigModel.server_id, ServerConfigModel.high_score)
+                      .order_by(ServerConfigModel.high_score.desc())
+                      .limit(10))
+
     def __init__(self):
         super().__init__(name='leaderboard')
 
@@ -1109,57 +1577,36 @@ class LeaderboardCmdGroup(app_commands.Group):
             description=''
         )
 
+        if board_metric not in self.__SERVER_USER_BOARDS:
+            raise ValueError(f'Unknown metric {board_metric}')
+
+        # everything that only depends on the choices is decided before the connection is opened
         match board_scope:
             case 'server':
                 emb.set_author(name=interaction.guild.name,
                                icon_url=interaction.guild.icon.url if interaction.guild.icon else None)
+                stmt = self.__SERVER_USER_BOARDS[board_metric]
+                empty_board_description: str = ':warning: No users have played in this server yet!'
             case 'global':
                 emb.set_author(name='Global')
+                stmt = self.__GLOBAL_USER_BOARDS[board_metric]
+                empty_board_description: str = ':warning: No users have played yet!'
+            case _:
+                raise ValueError(f'Unknown scope {board_scope}')
 
-        async with bot.db_connection(locked=False) as connection:
-            limit = 10
-
-            match board_metric:
-                case 'score':
-                    field = MemberModel.score
-                case 'karma':
-                    field = MemberModel.karma
-                case _:
-                    raise ValueError(f'Unknown metric {board_metric}')
-
-            match board_scope:
-                case 'server':
-                    stmt = (select(MemberModel.member_id, field)
-                            .where(MemberModel.server_id == interaction.guild.id)
-                            .order_by(field.desc())
-                            .limit(limit))
-                case 'global':
-                    stmt = (select(MemberModel.member_id, func.sum(field))
-                            .group_by(MemberModel.member_id)
-                            .order_by(func.sum(field).desc())
-                            .limit(limit))
-                case _:
-                    raise ValueError(f'Unknown scope {board_scope}')
+        line_format: str = '{}. <@{}> **{:.2f}**\n' if board_metric == 'karma' else '{}. <@{}> **{}**\n'
 
-            result: CursorResult = await connection.execute(stmt)
+        async with bot.db_connection(locked=False) as connection:
+            result: CursorResult = await connection.execute(stmt, {'filter_server_id': interaction.guild.id})
             data: Sequence[Row[tuple[int, int | float]]] = result.fetchall()
 
-            if len(data) == 0:  # Stop when no users could be retrieved.
-                match board_scope:
-                    case 'server':
-                        emb.description = ':warning: No users have played in this server yet!'
-                    case 'global':
-                        emb.description = ':warning: No users have played yet!'
-            else:
-                for i, user_data in enumerate(data, 1):
-                    member_id, score_or_karma = user_data
-                    match board_metric:
-                        case 'score':
-                            emb.description += f'{i}. <@{member_id}> **{score_or_karma}**\n'
-                        case 'karma':
-                            emb.description += f'{i}. <@{member_id}> **{score_or_karma:.2f}**\n'
+        if len(data) == 0:  # Stop when no users could be retrieved.
+            emb.description = empty_board_description
+        else:
+            emb.description = ''.join(line_format.format(i, member_id, score_or_karma)
+                                      for i, (member_id, score_or_karma) in enumerate(data, 1))
 
-            await interaction.followup.send(embed=emb)
+        await interaction.followup.send(embed=emb)
 
 # ---------------------------------------------------------------------------------------------------------------
 
@@ -1175,27 +1622,44 @@ class LeaderboardCmdGroup(app_commands.Group):
         ).set_author(name='Global')
 
         async with bot.db_connection(locked=False) as connection:
-            limit = 10
-
-            stmt = (select(ServerConfigModel.server_id, ServerConfigModel.high_score)
-                    .order_by(ServerConfigModel.high_score.desc())
-                    .limit(limit))
-
-            result: CursorResult = await connection.execute(stmt)
+            result: CursorResult = await connection.execute(self.__SERVER_BOARD)
             data: Sequence[Row[tuple[int, int]]] = result.fetchall()
 
-            guild_names = defaultdict(lambda: 'unknown', {g.id: g.name for g in bot.guilds})
-            for i, server_data in enumerate(data, 1):
-                server_id, high_score = server_data
-                emb.description += f'{i}. {guild_names[server_id]} **{high_score}**\n'
+        lines: list[str] = []
+        for i, server_data in enumerate(data, 1):
+            server_id, high_score = server_data
+            guild: Optional[discord.Guild] = bot.get_guild(server_id)  # dict lookup in the cache of discord.py
+            lines.append(f'{i}. {guild.name if guild else "unknown"} **{high_score}**\n')
+        emb.description = ''.join(lines)
 
-            await interaction.followup.send(embed=emb)
+        await interaction.followup.send(embed=emb)
 
 # ===================================================================================================================
 
 
 class StatsCmdGroup(app_commands.Group):
 
+    # the stats of a member and their positions in the server are read in one statement, the positions are counted
+    # by correlated subqueries over the other members of the server
+    __OTHER_MEMBER = aliased(MemberModel)
+    __SELECT_MEMBER_STATS = select(
+        MemberModel.score,
+        MemberModel.karma,
+        MemberModel.correct,
+        MemberModel.wrong,
+        select(count(__OTHER_MEMBER.member_id)).where(
+            __OTHER_MEMBER.server_id == MemberModel.server_id,
+            __OTHER_MEMBER.score >= MemberModel.score
+        ).scalar_subquery().label('position_by_score'),
+        select(count(__OTHER_MEMBER.member_id)).where(
+            __OTHER_MEMBER.server_id == MemberModel.server_id,
+            __OTHER_MEMBER.karma >= MemberModel.karma
+        ).scalar_subquery().label('position_by_karma')
+    ).where(
+        MemberModel.server_id == bindparam('filter_server_id'),
+        MemberModel.member_id == bindparam('filter_member_id')
+    )
+
     def __init__(self):
         super().__init__(name='stats')
 
@@ -1204,9 +1668,9 @@ class StatsCmdGroup(app_commands.Group):
     @app_commands.command(description='Show the server stats for the word chain game')
     async def server(self, interaction: discord.Interaction) -> None:
         """Command to show the stats of the server"""
-        config: ServerConfig = bot.server_configs[interaction.guild.id]
+        config: Optional[ServerConfig] = bot.server_configs.get(interaction.guild.id)
 
-        if config.channel_id is None:  # channel not set yet
+        if config is None or config.channel_id is None:  # channel not set yet
             await interaction.response.send_message("Counting channel not set yet!")
             return
 
@@ -1241,43 +1705,28 @@ Longest chain length: {config.high_score}
                 return None
 
         async with bot.db_connection(locked=False) as connection:
-            stmt = select(MemberModel).where(
-                MemberModel.server_id == member.guild.id,
-                MemberModel.member_id == member.id
-            )
-            result: CursorResult = await connection.execute(stmt)
-            row = result.fetchone()
-
-            if row is None:
-                await interaction.followup.send('You have never played in this server!')
-                return
-
-            db_member = Member.model_validate(row)
-
-            stmt = select(count(MemberModel.member_id)).where(
-                MemberModel.server_id == member.guild.id,
-                MemberModel.score >= db_member.score
-            )
-            result: CursorResult = await connection.execute(stmt)
-            pos_by_score = result.scalar()
+            result: CursorResult = await connection.execute(self.__SELECT_MEMBER_STATS, {
+                'filter_server_id': member.guild.id,
+                'filter_member_id': member.id
+            })
+            row: Optional[Row[tuple[int, float, int, int, int, int]]] = result.first()
+
+        if row is None:
+            await interaction.followup.send('You have never played in this server!')
+            return
 
-            stmt = select(count(MemberModel.member_id)).where(
-                MemberModel.server_id == member.guild.id,
-                MemberModel.karma >= db_member.karma
-            )
-            result: CursorResult = await connection.execute(stmt)
-            pos_by_karma = result.scalar()
+        score, karma, correct, wrong, pos_by_score, pos_by_karma = row
 
-            emb = discord.Embed(
-                color=discord.Color.blue(),
-                description=f'''**Score:** {db_member.score} (#{pos_by_score})
-**🌟Karma:** {db_member.karma:.2f} (#{pos_by_karma})
-**✅Correct:** {db_member.correct}
-**❌Wrong:** {db_member.wrong}
-**Accuracy:** {(db_member.correct / (db_member.correct + db_member.wrong)):.2%}'''
-            ).set_author(name=f"{member} | stats", icon_url=get_member_avatar())
+        emb = discord.Embed(
+            color=discord.Color.blue(),
+            description=f'''**Score:** {score} (#{pos_by_score})
+**🌟Karma:** {karma:.2f} (#{pos_by_karma})
+**✅Correct:** {correct}
+**❌Wrong:** {wrong}
+**Accuracy:** {(correct / (correct + wrong)):.2%}'''
+        ).set_author(name=f"{member} | stats", icon_url=get_member_avatar())
 
-            await interaction.followup.send(embed=emb)
+        await interaction.followup.send(embed=emb)
 
 
 # ===================================================================================================================
@@ -1297,22 +1746,24 @@ class BlacklistCmdGroup(app_commands.Group):
     async def add(self, interaction: discord.Interaction, word: str) -> None:
         await interaction.response.defer()
 
+        word = word.lower()
         emb: discord.Embed = discord.Embed(colour=discord.Color.blurple())
 
-        if not all(c in POSSIBLE_CHARACTERS for c in word.lower()):
-            emb.description = f'⚠️ The word *{word.lower()}* is not a legal word.'
+        if not bot.word_matches_pattern(word):
+            emb.description = f'⚠️ The word *{word}* is not a legal word.'
             await interaction.followup.send(embed=emb)
             return
 
         async with bot.db_connection() as connection:
             stmt = insert(BlacklistModel).values(
                 server_id=interaction.guild.id,
-                word=word.lower()
+                word=word
             ).prefix_with('OR IGNORE')
             await connection.execute(stmt)
             await connection.commit()
+            bot.server_blacklists[interaction.guild.id].add(word)
 
-        emb.description = f'✅ The word *{word.lower()}* was successfully added to the blacklist.'
+        emb.description = f'✅ The word *{word}* was successfully added to the blacklist.'
         await interaction.followup.send(embed=emb)
 
     # ---------------------------------------------------------------------------------------------------------------
@@ -1322,22 +1773,24 @@ class BlacklistCmdGroup(app_commands.Group):
     async def remove(self, interaction: discord.Interaction, word: str) -> None:
         await interaction.response.defer()
 
+        word = word.lower()
         emb: discord.Embed = discord.Embed(colour=discord.Color.blurple())
 
-        if not all(c in POSSIBLE_CHARACTERS for c in word.lower()):
-            emb.description = f'⚠️ The word *{word.lower()}* is not a legal word.'
+        if not bot.word_matches_pattern(word):
+            emb.description = f'⚠️ The word *{word}* is not a legal word.'
             await interaction.followup.send(embed=emb)
             return
 
         async with bot.db_connection() as connection:
             stmt = delete(BlacklistModel).where(
                 BlacklistModel.server_id == interaction.guild.id,
-                BlacklistModel.word == word.lower()
+                BlacklistModel.word == word
             )
             await connection.execute(stmt)
             await connection.commit()
+            bot.server_blacklists[interaction.guild.id].discard(word)
 
-        emb.description = f'✅ The word *{word.lower()}* was successfully removed from the blacklist.'
+        emb.description = f'✅ The word *{word}* was successfully removed from the blacklist.'
         await interaction.followup.send(embed=emb)
 
     # ---------------------------------------------------------------------------------------------------------------
@@ -1357,10 +1810,7 @@ class BlacklistCmdGroup(app_commands.Group):
                 emb.description = f'No word has been blacklisted in this server.'
                 await interaction.followup.send(embed=emb)
             else:
-                i: int = 0
-                for word in words:
-                    i += 1
-                    emb.description += f'{i}. {word}\n'
+                emb.description = ''.join(f'{i}. {word}\n' for i, word in enumerate(words, 1))
 
                 await interaction.followup.send(embed=emb)
 
@@ -1387,22 +1837,24 @@ class WhitelistCmdGroup(app_commands.Group):
     async def add(self, interaction: discord.Interaction, word: str) -> None:
         await interaction.response.defer()
 
+        word = word.lower()
         emb: discord.Embed = discord.Embed(colour=discord.Color.blurple())
 
-        if not all(c in POSSIBLE_CHARACTERS for c in word.lower()):
-            emb.description = f'⚠️ The word *{word.lower()}* is not a legal word.'
+        if not bot.word_matches_pattern(word):
+            emb.description = f'⚠️ The word *{word}* is not a legal word.'
             await interaction.followup.send(embed=emb)
             return
 
         async with bot.db_connection() as connection:
             stmt = insert(WhitelistModel).values(
                 server_id=interaction.guild.id,
-                word=word.lower()
+                word=word
             ).prefix_with('OR IGNORE')
             await connection.execute(stmt)
             await connection.commit()
+            bot.server_whitelists[interaction.guild.id].add(word)
 
-        emb.description = f'✅ The word *{word.lower()}* was successfully added to the whitelist.'
+        emb.description = f'✅ The word *{word}* was successfully added to the whitelist.'
         await interaction.followup.send(embed=emb)
 
     # ---------------------------------------------------------------------------------------------------------------
@@ -1412,22 +1864,24 @@ class WhitelistCmdGroup(app_commands.Group):
     async def remove(self, interaction: discord.Interaction, word: str) -> None:
         await interaction.response.defer()
 
+        word = word.lower()
         emb: discord.Embed = discord.Embed(colour=discord.Color.blurple())
 
-        if not all(c in POSSIBLE_CHARACTERS for c in word.lower()):
-            emb.description = f'⚠️ The word *{word.lower()}* is not a legal word.'
+        if not bot.word_matches_pattern(word):
+            emb.description = f'⚠️ The word *{word}* is not a legal word.'
             await interaction.followup.send(embed=emb)
             return
 
         async with bot.db_connection() as connection:
             stmt = delete(WhitelistModel).where(
                 WhitelistModel.server_id == interaction.guild.id,
-                WhitelistModel.word == word.lower()
+                WhitelistModel.word == word
             )
             await connection.execute(stmt)
             await connection.commit()
+            bot.server_whitelists[interaction.guild.id].discard(word)
 
-        emb.description = f'✅ The word *{word.lower()}* has been removed from the whitelist.'
+        emb.description = f'✅ The word *{word}* has been removed from the whitelist.'
         await interaction.followup.send(embed=emb)
 
     # ---------------------------------------------------------------------------------------------------------------
@@ -1447,10 +1901,7 @@ class WhitelistCmdGroup(app_commands.Group):
                 emb.description = f'No word has been whitelisted in this server.'
                 await interaction.followup.send(embed=emb)
             else:
-                i: int = 0
-                for word in words:
-                    i += 1
-                    emb.description += f'{i}. {word}\n'
+                emb.description = ''.join(f'{i}. {word}\n' for i, word in enumerate(words, 1))
 
                 await interaction.followup.send(embed=emb)
 
@@ -2,7 +2,7 @@ import contextlib
 from typing import Callable, Optional
 
 from pydantic import BaseModel
-from sqlalchemy import Boolean, Float, Integer, String, update
+from sqlalchemy import Boolean, Float, Index, Integer, String, bindparam, update
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -46,6 +46,37 @@ class MemberModel(Base):
     wrong: Mapped[int] = mapped_column(Integer)
     karma: Mapped[float] = mapped_column(Float)
 
+    # serve the per-server leaderboards without sorting the whole table
+    __table_args__ = (
+        Index('ix_member_server_id_score', 'server_id', 'score'),
+        Index('ix_member_server_id_karma', 'server_id', 'karma'),
+    )
+
+
+class GlobalMemberTotalModel(Base):
+    """
+    Sums of the scores and karma of each member over all servers, for the global leaderboards. The rows are
+    maintained by triggers on the `member` table, see the migration that created this table.
+    """
+    __tablename__ = 'global_member_total'
+    member_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    member_count: Mapped[int] = mapped_column(Integer)  # number of rows of the member in `member`
+    score: Mapped[int] = mapped_column(Integer)
+    karma: Mapped[float] = mapped_column(Float)
+
+    __table_args__ = (
+        Index('ix_global_member_total_score', 'score'),
+        Index('ix_global_member_total_karma', 'karma'),
+    )
+
+
+# triggers that maintain `global_member_total`, the bot checks at startup that no later migration dropped them
+GLOBAL_MEMBER_TOTAL_TRIGGERS: frozenset[str] = frozenset({
+    'member_global_total_insert',
+    'member_global_total_update',
+    'member_global_total_delete',
+})
+
 
 class BlacklistModel(Base):
     __tablename__ = 'blacklist'
@@ -59,6 +90,27 @@ class WhitelistModel(Base):
     word: Mapped[str] = mapped_column(String, primary_key=True)
 
 
+_SERVER_CONFIG_UPDATE_COLUMNS: tuple[str, ...] = (
+    'channel_id', 'current_count', 'current_word', 'high_score', 'used_high_score_emoji', 'reliable_role_id',
+    'failed_role_id', 'last_member_id', 'failed_member_id', 'correct_inputs_by_failed_member'
+)
+
+# signature of `Bot.db_connection`, which is passed to `ServerConfig.sync_to_db`
+ConnectionFactory = Callable[[bool, Optional[int]], contextlib.AbstractAsyncContextManager[AsyncConnection]]
+
+# reactions for special chain lengths, see `ServerConfig.reaction_emoji`
+_COUNT_REACTION_EMOJIS: dict[int, str] = {
+    100: "💯",
+    69: "😏",
+    666: "👹",
+}
+
+# built once, the values of a config are bound on execution, see `ServerConfig.update_parameters`
+UPDATE_SERVER_CONFIG = update(ServerConfigModel).where(
+    ServerConfigModel.server_id == bindparam('filter_server_id')
+).values({column: bindparam(f'new_{column}') for column in _SERVER_CONFIG_UPDATE_COLUMNS})
+
+
 class ServerConfig(BaseModel):
     server_id: int
     channel_id: Optional[int] = None
@@ -93,7 +145,8 @@ class ServerConfig(BaseModel):
         self.last_member_id = member_id
 
         # check the high score
-        self.high_score = max(self.high_score, self.current_count)
+        if self.current_count > self.high_score:
+            self.high_score = self.current_count
 
     def reaction_emoji(self) -> str:
         """
@@ -103,56 +156,32 @@ class ServerConfig(BaseModel):
             emoji = "🎉"
             self.used_high_score_emoji = True
         else:
-            emoji = {
-                100: "💯",
-                69: "😏",
-                666: "👹",
-            }.get(self.current_count, "✅")
+            emoji = _COUNT_REACTION_EMOJIS.get(self.current_count, "✅")
         return emoji
 
-    def __update_statement(self):
-        stmt = update(ServerConfigModel).values(
-            channel_id=self.channel_id,
-            current_count=self.current_count,
-            current_word=self.current_word,
-            high_score=self.high_score,
-            used_high_score_emoji=self.used_high_score_emoji,
-            reliable_role_id=self.reliable_role_id,
-            failed_role_id=self.failed_role_id,
-            last_member_id=self.last_member_id,
-            failed_member_id=self.failed_member_id,
-            correct_inputs_by_failed_member=self.correct_inputs_by_failed_member
-        ).where(ServerConfigModel.server_id == self.server_id)
-        return stmt
-
-    async def sync_to_db(self, async_engine_generator: Callable[[bool], contextlib.AbstractAsyncContextManager[AsyncConnection]]):
+    def update_parameters(self) -> dict[str, Optional[int | str | bool]]:
+        """
+        Get the values of this config as parameters for `UPDATE_SERVER_CONFIG`.
+        """
+        return {
+            'filter_server_id': self.server_id,
+            **{f'new_{column}': getattr(self, column) for column in _SERVER_CONFIG_UPDATE_COLUMNS}
+        }
+
+    async def sync_to_db(self, async_engine_generator: ConnectionFactory):
         """
         Synchronizes itself with the DB.
         """
-        async with async_engine_generator(True) as connection:
-            stmt = self.__update_statement()
-            await connection.execute(stmt)
+        async with async_engine_generator(True, self.server_id) as connection:
+            await connection.execute(UPDATE_SERVER_CONFIG, self.update_parameters())
             await connection.commit()
 
     async def sync_to_db_with_connection(self, connection: AsyncConnection) -> int:
         """
         Synchronizes itself with the DB using an existing connection without committing.
         """
-        stmt = self.__update_statement()
-        result = await connection.execute(stmt)
+        result = await connection.execute(UPDATE_SERVER_CONFIG, self.update_parameters())
         return result.rowcount  # noqa: custom property with memoization which IDEs won't recognize as a property
 
     class Config:
         from_attributes = True
-
-
-class Member(BaseModel):
-    server_id: int
-    member_id: int
-    score: int
-    correct: int
-    wrong: int
-    karma: float
-
-    class Config:
-        from_attributes = True
@@ -3,6 +3,7 @@ from collections import deque
 
 import pytest
 
+from bloom_filter import BloomFilter
 from data import calculate_total_karma
 
 LIST_LENGTH = 5
@@ -107,3 +108,13 @@ def test_decrease_on_same_ending_letter(same_ending_letter_words: list[str], emp
         assert karma < last_karma
         last_karma = karma
         empty_history.append(word)
+
+
+def test_bloom_filter_contains_added_words():
+    bloom_filter = BloomFilter(1000)
+    words = [f'word{i}' for i in range(1000)]
+    for word in words:
+        bloom_filter.add(word)
+    assert all(word in bloom_filter for word in words)
+    # 1% expected, leave some room for the randomness of the hashes
+    assert sum(f'other{i}' in bloom_filter for i in range(1000)) < 30